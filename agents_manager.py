@@ -1,9 +1,13 @@
 # agents_manager.py
-from typing import Dict, List
+import functools
+from typing import Dict, List, Tuple
 from autogen_agentchat.agents import AssistantAgent
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from config import AGENT_CONFIGS
 
+# 标识符中不允许的字符 -> 下划线
+_IDENTIFIER_TRANS = str.maketrans({"-": "_", " ": "_"})
+
 class AgentsManager:
     """管理所有编辑Agent"""
     
@@ -34,9 +38,9 @@ class AgentsManager:
         """获取指定Agent"""
         return self.agents.get(agent_key)
     
-    def get_agents(self, agent_keys: List[str]) -> List[AssistantAgent]:
+    def get_agents(self, agent_keys: List[str]) -> Tuple[AssistantAgent, ...]:
         """获取多个Agent"""
-        return [self.agents[key] for key in agent_keys if key in self.agents]
+        return tuple(self.agents[key] for key in agent_keys if key in self.agents)
     
     def list_agents(self) -> Dict[str, str]:
         """列出所有可用Agent"""
@@ -44,6 +48,7 @@ class AgentsManager:
                 if key in self.agents}
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _convert_to_valid_identifier(name: str) -> str:
         """
         将字符串转换为有效的Python标识符
@@ -51,7 +56,7 @@ class AgentsManager:
              "fact_checker" -> "fact_checker"
         """
         # 替换不允许的字符
-        valid_name = name.replace("-", "_").replace(" ", "_")
+        valid_name = name.translate(_IDENTIFIER_TRANS)
         # 确保开头是字母或下划线
         if valid_name and not (valid_name[0].isalpha() or valid_name[0] == "_"):
             valid_name = "_" + valid_name
@@ -1,14 +1,94 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+import asyncio
+import copy
+import hashlib
+import json
+
+
+class SemanticCache:
+    """Embedding-similarity response cache
+
+    Prompts are embedded with ``embed_fn`` and compared against previously
+    answered prompts; a cached response is reused when the cosine similarity
+    exceeds ``threshold``.
+    """
+
+    def __init__(self,
+                 embed_fn: Callable[[str], Awaitable[Sequence[float]]],
+                 threshold: float = 0.92,
+                 max_entries: int = 4096):
+        import numpy as np  # only needed when a semantic cache is configured
+
+        self._np = np
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._matrix = None  # [capacity, D] L2-normalized embeddings
+        self._size = 0
+        self._next = 0  # ring buffer write index once the cache is full
+        self._responses: List[Any] = []
+        self.hits = 0
+        self.misses = 0
+
+    async def embed(self, prompt: str):
+        """Embed and L2-normalize a prompt"""
+        vector = self._np.asarray(await self.embed_fn(prompt), dtype=self._np.float32)
+        norm = self._np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding) -> Tuple[bool, Any]:
+        """Return (hit, response) for the nearest cached prompt"""
+        if self._size:
+            scores = self._matrix[:self._size] @ embedding
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold:
+                self.hits += 1
+                return True, self._responses[best]
+        self.misses += 1
+        return False, None
+
+    def add(self, embedding, response: Any):
+        """Store a response for the given prompt embedding"""
+        np = self._np
+        if self._matrix is None:
+            self._matrix = np.empty((min(16, self.max_entries), embedding.shape[0]), dtype=np.float32)
+        if self._size < self.max_entries:
+            if self._size == self._matrix.shape[0]:
+                grown = np.empty((min(self._size * 2, self.max_entries), self._matrix.shape[1]),
+                                 dtype=np.float32)
+                grown[:self._size] = self._matrix
+                self._matrix = grown
+            slot = self._size
+            self._responses.append(response)
+            self._size += 1
+        else:
+            # Full: overwrite the oldest slot in place (ring buffer)
+            slot = self._next
+            self._responses[slot] = response
+        self._matrix[slot] = embedding
+        self._next = (slot + 1) % self.max_entries
 
 
 class BaseAIAgent(ABC):
     """Base class for all AI agents"""
 
-    def __init__(self, name: str, system_message: str, model_config: Dict[str, Any]):
+    # Exact-match response cache shared by all agents (LRU, bounded)
+    _cache: "OrderedDict[str, Any]" = OrderedDict()
+    _cache_max_size: int = 1024
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # Calls currently in flight, so identical concurrent prompts share one LLM call
+    _inflight: "Dict[str, asyncio.Future]" = {}
+    cache_coalesced: int = 0
+
+    def __init__(self, name: str, system_message: str, model_config: Dict[str, Any],
+                 semantic_cache: Optional[SemanticCache] = None):
         self.name = name
         self.system_message = system_message
         self.model_config = model_config
+        self.semantic_cache = semantic_cache
 
     @abstractmethod
     async def process(self, input_data: Any) -> Any:
@@ -20,8 +100,78 @@ class BaseAIAgent(ABC):
         """Get the capabilities of the agent"""
         pass
 
+    def _cache_key(self, prompt: str) -> str:
+        """Build a deterministic cache key for the given prompt"""
+        payload = json.dumps(
+            {
+                "name": self.name,
+                "sys": self.system_message,
+                "cfg": self.model_config,
+                "p": prompt
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _is_cacheable(self) -> bool:
+        """Only calls explicitly configured with temperature 0 are safe to cache
+
+        Providers default to a non-zero temperature, so a missing key means
+        sampled output and must not be cached.
+        """
+        return self.model_config.get("temperature") == 0
+
     async def run(self, prompt: str) -> Any:
         """Run the agent with the given prompt"""
+        if not self._is_cacheable():
+            return await self._run_uncached(prompt)
+
+        cls = BaseAIAgent
+        key = self._cache_key(prompt)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            cls.cache_hits += 1
+            # Hand out copies so a caller mutating its result cannot alter later hits
+            return copy.deepcopy(cls._cache[key])
+
+        task = cls._inflight.get(key)
+        if task is None:
+            cls.cache_misses += 1
+            task = asyncio.ensure_future(self._run_semantic(prompt))
+            cls._inflight[key] = task
+            task.add_done_callback(lambda done: cls._finish_inflight(key, done))
+        else:
+            cls.cache_coalesced += 1
+        # shield: a cancelled caller must not cancel the call other waiters share
+        return copy.deepcopy(await asyncio.shield(task))
+
+    @classmethod
+    def _finish_inflight(cls, key: str, task: "asyncio.Future") -> None:
+        """Move a finished in-flight call into the response cache"""
+        cls._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        cls._cache[key] = task.result()
+        if len(cls._cache) > cls._cache_max_size:
+            cls._cache.popitem(last=False)
+
+    async def _run_semantic(self, prompt: str) -> Any:
+        """Run through the semantic cache when one is configured"""
+        if self.semantic_cache is None:
+            return await self._run_uncached(prompt)
+
+        embedding = await self.semantic_cache.embed(prompt)
+        hit, response = self.semantic_cache.lookup(embedding)
+        if hit:
+            return response
+
+        result = await self._run_uncached(prompt)
+        self.semantic_cache.add(embedding, result)
+        return result
+
+    async def _run_uncached(self, prompt: str) -> Any:
+        """Run the agent without consulting the response cache"""
         # This is a placeholder implementation
         # In a real implementation, this would call the LLM
         return {
@@ -30,4 +180,4 @@ class BaseAIAgent(ABC):
                 "agent_type": self.__class__.__name__,
                 "model_config": self.model_config
             }
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,11 @@
+"""
+Shared JSON response helper for the web UI
+"""
+from typing import Any
+from fastapi.responses import Response
+import orjson
+
+
+def json_response(content: Any) -> Response:
+    """Serialize with orjson and return the bytes directly, skipping jsonable_encoder"""
+    return Response(content=orjson.dumps(content), media_type="application/json")
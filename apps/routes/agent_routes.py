@@ -1,14 +1,17 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+from apps.responses import json_response
 from ai_agents.base import BaseAIAgent  # Placeholder for now
 from core.agent_manager import AgentManager, ModelConfig
 import asyncio
+import orjson
 
 router = APIRouter()
 agent_manager = AgentManager()
 
-@router.get("/agents/status")
-async def get_agents_status():
-    """Get status of all AI agents"""
+
+def _build_status_json() -> bytes:
+    """Serialize the status of all AI agents"""
     model_configs = agent_manager.model_configs.model_configs
     status = {}
 
@@ -19,41 +22,51 @@ async def get_agents_status():
             "status": "ready"  # Placeholder for actual availability check
         }
 
-    return {"agents": status}
+    return orjson.dumps({"agents": status})
+
+
+# Status is static until a real availability check exists
+_STATUS_JSON = _build_status_json()
+_VALID_AGENT_TYPES = frozenset(agent_manager.model_configs.model_configs)
+
+@router.get("/agents/status")
+async def get_agents_status():
+    """Get status of all AI agents"""
+    return Response(content=_STATUS_JSON, media_type="application/json")
 
 @router.get("/agents/{agent_type}")
 async def get_agent_info(agent_type: str):
     """Get information about a specific agent"""
-    model_configs = agent_manager.model_configs.model_configs
-
-    if agent_type not in model_configs:
+    if agent_type not in _VALID_AGENT_TYPES:
         raise HTTPException(status_code=404, detail=f"Agent type {agent_type} not found")
 
+    model_configs = agent_manager.model_configs.model_configs
+
     config = model_configs[agent_type]
-    return {
+    return json_response({
         "agent_type": agent_type,
         "model": config["model"],
         "description": config["description"],
         "capabilities": config["capabilities"],
         "status": "ready"
-    }
+    })
 
 @router.post("/agents/test/{agent_type}")
 async def test_agent(agent_type: str, test_prompt: str = "{test prompt goes here. Please return test output}"):
     """Test an agent with a simple prompt"""
-    model_configs = agent_manager.model_configs.model_configs
-
-    if agent_type not in model_configs:
+    if agent_type not in _VALID_AGENT_TYPES:
         raise HTTPException(status_code=404, detail=f"Agent type {agent_type} not found")
 
+    model_configs = agent_manager.model_configs.model_configs
+
     try:
         # Create and use the agent for test
         agent = agent_manager.get_agent(agent_type)
         # Simple test would be performed here
-        return {
+        return json_response({
             "agent_type": agent_type,
             "status": "test_completed",
             "response": f"Test completed for {agent_type} using model {model_configs[agent_type]['model']}"
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Test failed: {str(e)}")
\ No newline at end of file
@@ -1,29 +1,41 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
 from typing import Dict
+import orjson
+from apps.responses import json_response
 from core.agent_manager import ModelConfig
 
 router = APIRouter()
 model_config = ModelConfig()
 
+# model_configs is fixed at process start, so the response bodies are serialized once
+_VALID_AGENT_TYPES = frozenset(model_config.model_configs)
+_MODELS_JSON = orjson.dumps({"models": model_config.model_configs})
+_MODEL_CONFIG_JSON = {
+    agent_type: orjson.dumps({"agent_type": agent_type, "config": config})
+    for agent_type, config in model_config.model_configs.items()
+}
+
 @router.get("/models")
 async def get_model_types():
     """Get all available agent and their model configurations"""
-    return {"models": model_config.model_configs}
+    return Response(content=_MODELS_JSON, media_type="application/json")
 
 @router.get("/models/{agent_type}")
 async def get_model_config(agent_type: str):
     """Get model configuration for a specific agent type"""
-    if agent_type not in model_config.model_configs:
+    body = _MODEL_CONFIG_JSON.get(agent_type)
+    if body is None:
         raise HTTPException(status_code=404, detail=f"Agent type {agent_type} not found")
 
-    return {"agent_type": agent_type, "config": model_config.model_configs[agent_type]}
+    return Response(content=body, media_type="application/json")
 
 @router.put("/models/{agent_type}")
 async def update_model_config(agent_type: str, config: Dict):
     """Update model configuration for specific agent"""
-    if agent_type not in model_config.model_configs:
+    if agent_type not in _VALID_AGENT_TYPES:
         raise HTTPException(status_code=404, detail=f"Agent type {agent_type} not found")
 
     # Update the configuration - for now we'll just log this as a sample
     # In a real implementation, you might update specific config properties
-    return {"agent_type": agent_type, "updated_config": config}
\ No newline at end of file
+    return json_response({"agent_type": agent_type, "updated_config": config})
\ No newline at end of file
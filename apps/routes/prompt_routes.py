@@ -1,31 +1,68 @@
-from fastapi import APIRouter, HTTPException, File, UploadFile
-from typing import Dict, List
+from fastapi import APIRouter, HTTPException, File, UploadFile, Path as PathParam
+from typing import Annotated, Dict, List
+import aiofiles
+import asyncio
 import os
 import json
 from pathlib import Path
+from apps.responses import json_response
 
 router = APIRouter()
 
+# Agent type path parameters double as file names, so restrict them before touching the filesystem
+AgentTypeParam = Annotated[str, PathParam(pattern=r"^[A-Za-z0-9_\-]{1,64}$")]
+
+# Agent types with a prompt file (the file name matches the agent type)
+_PROMPT_AGENT_TYPES = frozenset({
+    "mythologist",
+    "writer",
+    "fact_checker",
+    "dialogue_specialist",
+    "editor",
+    "documentation_specialist"
+})
+
+# Prompt file contents keyed by path, validated against st_mtime_ns
+_prompt_cache: Dict[str, tuple] = {}
+_prompt_cache_lock = asyncio.Lock()
+# Template file listing keyed by directory, validated against the directory's st_mtime_ns
+_template_list_cache: Dict[str, tuple] = {}
+# Template listing items (with their preview snippet) keyed by path, validated against st_mtime_ns
+_template_item_cache: Dict[str, tuple] = {}
+
+
+def _mtime_ns(path) -> int:
+    """Return the file's st_mtime_ns, or -1 if it does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return -1
+
+
+async def _read_prompt_file(path: str, mtime_ns: int) -> str:
+    """Read a prompt file, serving it from cache while its mtime is unchanged"""
+    cached = _prompt_cache.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    # Concurrent misses for the same file wait for a single reload
+    async with _prompt_cache_lock:
+        cached = _prompt_cache.get(path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        async with aiofiles.open(path, "r", encoding="utf-8") as f:
+            content = await f.read()
+        _prompt_cache[path] = (mtime_ns, content)
+    return content
+
 @router.get("/prompts/{agent_type}")
-async def get_prompt(agent_type: str):
+async def get_prompt(agent_type: AgentTypeParam):
     """Get prompt for a specific agent type"""
     prompt_file_path = f"prompts/{agent_type}.md"
 
-    if not os.path.exists(prompt_file_path):
-        # Also try the original naming format
-        mapping = {
-            "mythologist": "mythologist",
-            "writer": "writer",
-            "fact_checker": "fact_checker",
-            "dialogue_specialist": "dialogue_specialist",
-            "editor": "editor",
-            "documentation_specialist": "documentation_specialist"
-        }
-        agent_short = mapping.get(agent_type)
-        if agent_short:
-            prompt_file_path = f"prompts/{agent_short}.md"
-
-    if not os.path.exists(prompt_file_path):
+    mtime_ns = await asyncio.to_thread(_mtime_ns, prompt_file_path)
+    if mtime_ns < 0:
         # Return default templates if files don't exist
         default_templates = {
             "writer": "You are a creative story writer...",
@@ -35,53 +72,63 @@ async def get_prompt(agent_type: str):
         }
         # If not even a default is found
         content = default_templates.get(agent_type, f"Default prompt for {agent_type}")
-        return {"agent_type": agent_type, "content": content, "path": prompt_file_path}
+        return json_response({"agent_type": agent_type, "content": content, "path": prompt_file_path})
 
-    with open(prompt_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+    content = await _read_prompt_file(prompt_file_path, mtime_ns)
 
-    return {"agent_type": agent_type, "content": content, "path": prompt_file_path}
+    return json_response({"agent_type": agent_type, "content": content, "path": prompt_file_path})
 
 @router.put("/prompts/{agent_type}")
-async def update_prompt(agent_type: str, content: str):
+async def update_prompt(agent_type: AgentTypeParam, content: str):
     """Update prompt for a specific agent type"""
-    # Map the agent type to proper file name
-    mapping = {
-        "mythologist": "mythologist",
-        "writer": "writer",
-        "fact_checker": "fact_checker",
-        "dialogue_specialist": "dialogue_specialist",
-        "editor": "editor",
-        "documentation_specialist": "documentation_specialist"
-    }
-
-    agent_short = mapping.get(agent_type)
-    if not agent_short:
+    # Agent types map one-to-one onto prompt file names
+    if agent_type not in _PROMPT_AGENT_TYPES:
         raise HTTPException(status_code=400, detail=f"Unknown agent type: {agent_type}")
 
-    prompt_file_path = f"prompts/{agent_short}.md"
+    prompt_file_path = f"prompts/{agent_type}.md"
 
     # Ensure directory exists
-    os.makedirs(os.path.dirname(prompt_file_path), exist_ok=True)
+    await asyncio.to_thread(os.makedirs, os.path.dirname(prompt_file_path), exist_ok=True)
 
-    with open(prompt_file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    async with aiofiles.open(prompt_file_path, "w", encoding="utf-8") as f:
+        await f.write(content)
+    _prompt_cache.pop(prompt_file_path, None)
 
-    return {"agent_type": agent_type, "updated": True, "path": prompt_file_path}
+    return json_response({"agent_type": agent_type, "updated": True, "path": prompt_file_path})
 
 @router.get("/prompt/templates")
 async def get_prompt_templates():
     """Get available prompt templates"""
     templates_dir = Path("prompts/templates")
-    if templates_dir.exists():
+    dir_mtime_ns = await asyncio.to_thread(_mtime_ns, templates_dir)
+    if dir_mtime_ns >= 0:
+        cached = _template_list_cache.get(str(templates_dir))
+        if cached and cached[0] == dir_mtime_ns:
+            files = cached[1]
+        else:
+            files = await asyncio.to_thread(lambda: tuple(templates_dir.glob("*.md")))
+            _template_list_cache[str(templates_dir)] = (dir_mtime_ns, files)
+
+        # Stat every template in one worker-thread hop
+        mtimes = await asyncio.to_thread(lambda: [_mtime_ns(file) for file in files])
+
         templates = []
-        for file in templates_dir.glob("*.md"):
-            with open(file, "r", encoding="utf-8") as f:
-                content = f.read()
-                templates.append({
-                    "name": file.name.replace('.md', ''),
-                    "path": str(file),
-                    "content_preview": content[:100] + "..." if len(content) > 100 else content
-                })
-        return {"templates": templates}
-    return {"templates": []}
\ No newline at end of file
+        for file, file_mtime_ns in zip(files, mtimes):
+            if file_mtime_ns < 0:
+                continue
+            path = str(file)
+            cached_item = _template_item_cache.get(path)
+            if cached_item and cached_item[0] == file_mtime_ns:
+                templates.append(cached_item[1])
+                continue
+
+            content = await _read_prompt_file(path, file_mtime_ns)
+            item = {
+                "name": file.name.replace('.md', ''),
+                "path": path,
+                "content_preview": content[:100] + "..." if len(content) > 100 else content
+            }
+            _template_item_cache[path] = (file_mtime_ns, item)
+            templates.append(item)
+        return json_response({"templates": templates})
+    return json_response({"templates": []})
\ No newline at end of file
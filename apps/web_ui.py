@@ -2,17 +2,32 @@
 Web UI for AgentPress Enhancement
 """
 from fastapi import FastAPI, Request, HTTPException, Form
+from brotli_asgi import BrotliMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from typing import Optional, Dict, Any
-import json
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import asyncio
 import os
+from apps.responses import json_response
 from core.agent_manager import ModelConfig
 from knowledge.manager import KnowledgeManager
-from core.workflow import StoryWorkflow
 
-app = FastAPI(title="AgentPress Enhanced UI")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the event loop's default executor, which runs asyncio.to_thread and aiofiles I/O"""
+    default_size = max(32, (os.cpu_count() or 1) * 4)
+    executor = ThreadPoolExecutor(max_workers=int(os.getenv("THREADPOOL_SIZE", default_size)))
+    asyncio.get_running_loop().set_default_executor(executor)
+    yield
+    executor.shutdown()
+
+app = FastAPI(title="AgentPress Enhanced UI", lifespan=lifespan)
+# Brotli for clients that accept it, gzip otherwise
+app.add_middleware(BrotliMiddleware, quality=4, minimum_size=1024, gzip_fallback=True)
 templates = Jinja2Templates(directory="ui/templates")
 app.mount("/static", StaticFiles(directory="ui/static"), name="static")
 
@@ -28,12 +43,49 @@ async def root(request: Request):
 @app.get("/api/models")
 async def get_model_configurations():
     """Endpoint to get available model configurations"""
-    return {"model_configs": model_config.model_configs}
+    return json_response({"model_configs": model_config.model_configs})
 
 @app.get("/api/knowledge/search")
 async def search_knowledge(query: str, category: Optional[str] = None):
     """Endpoint to search knowledge base"""
     results = await knowledge_manager.search_knowledge(query, category)
-    return {"results": [r.__dict__ for r in results]}
+    return json_response({"results": [r.__dict__ for r in results]})
+
+class KnowledgeEntryRequest(BaseModel):
+    title: str
+    content: str
+    knowledge_type: str
+    tags: List[str] = []
+    source: str = "manual"
+
+@app.post("/knowledge/entry")
+async def add_knowledge_entry(entry: KnowledgeEntryRequest):
+    """Endpoint to add a knowledge entry"""
+    entry_id = await knowledge_manager.add_entry(
+        title=entry.title,
+        content=entry.content,
+        tags=entry.tags,
+        knowledge_type=entry.knowledge_type,
+        source=entry.source
+    )
+    if entry_id is None:
+        raise HTTPException(status_code=500, detail="Failed to save knowledge entry")
+    return json_response({"id": entry_id, "success": True})
+
+# We'll add more routes in subsequent tasks
+
+
+if __name__ == "__main__":
+    import uvicorn
 
-# We'll add more routes in subsequent tasks
\ No newline at end of file
+    # Single worker: knowledge entries live in this process's memory and are
+    # written back as a whole file, so extra workers would overwrite each other
+    uvicorn.run(
+        "apps.web_ui:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        log_level="warning",
+        access_log=False
+    )
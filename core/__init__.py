@@ -2,12 +2,23 @@
 Core modules for the AgentPress system
 """
 
-from .agent_manager import AgentManager, GroupChatCoordinator, DynamicModelAgentManager
-from .conversation_manager import ConversationManager
-
-__all__ = [
-    "AgentManager",
-    "GroupChatCoordinator",
-    "DynamicModelAgentManager",
-    "ConversationManager"
-]
\ No newline at end of file
+import importlib
+
+# Exported name -> submodule, imported on first access (PEP 562) so that
+# importing core does not pull in autogen
+_LAZY_EXPORTS = {
+    "AgentManager": ".agent_manager",
+    "GroupChatCoordinator": ".agent_manager",
+    "DynamicModelAgentManager": ".agent_manager",
+    "ConversationManager": ".conversation_manager"
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
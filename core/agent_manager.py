@@ -1,77 +1,60 @@
 # core/agent_manager.py
+import functools
 import os
-from typing import Dict, List, Optional, Any, Union
-from autogen_agentchat.agents import AssistantAgent
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple, Union
 from config import AGENT_CONFIGS
 from utils import extract_content, extract_all_json
 import asyncio
 
+if TYPE_CHECKING:
+    # autogen is heavy; it is imported at runtime only where agents are built
+    from autogen_agentchat.agents import AssistantAgent
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+
 
 class ModelConfig:
     """Configuration for different AI models per agent type"""
 
-    def __init__(self):
-        self.model_configs = {
-            "writer": self._get_writer_config(),
-            "editor": self._get_editor_config(),
-            "fact_checker": self._get_fact_checker_config(),
-            "dialogue_specialist": self._get_dialogue_specialist_config(),
-            "mythologist": self._get_researcher_config(),
-            "documentation_specialist": self._get_documentation_config()
-        }
-
-    def _get_writer_config(self):
+    # (agent type, model env var, description, capabilities)
+    _AGENT_MODEL_SPEC = (
         # Strong generative model
-        return {
-            "model": os.getenv("WRITER_MODEL", "gpt-4"),
-            "description": "Primary story content creation",
-            "capabilities": ["creative_generation", "narrative_control"]
-        }
-
-    def _get_editor_config(self):
+        ("writer", "WRITER_MODEL", "Primary story content creation",
+         ("creative_generation", "narrative_control")),
         # Assessment model
-        return {
-            "model": os.getenv("EDITOR_MODEL", "gpt-4"),
-            "description": "Overall story evaluation",
-            "capabilities": ["quality_assessment", "holistic_review"]
-        }
-
-    def _get_fact_checker_config(self):
+        ("editor", "EDITOR_MODEL", "Overall story evaluation",
+         ("quality_assessment", "holistic_review")),
         # Logic reasoning model
-        return {
-            "model": os.getenv("FACT_CHECKER_MODEL", "gpt-4"),
-            "description": "Logic and consistency verification",
-            "capabilities": ["logical_inference", "consistency_check"]
-        }
-
-    def _get_dialogue_specialist_config(self):
+        ("fact_checker", "FACT_CHECKER_MODEL", "Logic and consistency verification",
+         ("logical_inference", "consistency_check")),
         # Language understanding focused model
-        return {
-            "model": os.getenv("DIALOGUE_MODEL", "gpt-4"),
-            "description": "Dialogue evaluation and optimization",
-            "capabilities": ["dialogue_analysis", "character_voice"]
-        }
-
-    def _get_researcher_config(self):
+        ("dialogue_specialist", "DIALOGUE_MODEL", "Dialogue evaluation and optimization",
+         ("dialogue_analysis", "character_voice")),
         # Knowledge retrieval model (can be generic)
-        return {
-            "model": os.getenv("RESEARCHER_MODEL", "gpt-4"),
-            "description": "Background research and setting development",
-            "capabilities": ["research_synthesis", "background_development"]
-        }
-
-    def _get_documentation_config(self):
+        ("mythologist", "RESEARCHER_MODEL", "Background research and setting development",
+         ("research_synthesis", "background_development")),
         # Memory tracking model (long context)
-        return {
-            "model": os.getenv("DOCUMENTATION_MODEL", "gpt-4"),
-            "description": "Maintain consistency across long-form content",
-            "capabilities": ["memory_retention", "consistency_tracking"]
+        ("documentation_specialist", "DOCUMENTATION_MODEL", "Maintain consistency across long-form content",
+         ("memory_retention", "consistency_tracking")),
+    )
+
+    def __init__(self):
+        env = os.environ
+        self.model_configs = {
+            agent_type: {
+                "model": env.get(env_key, "gpt-4"),
+                "description": description,
+                "capabilities": list(capabilities)
+            }
+            for agent_type, env_key, description, capabilities in self._AGENT_MODEL_SPEC
         }
 
 
 class AgentManager:
-    """Updated Agent Manager with model-specific allocation"""
+    """Updated Agent Manager with model-specific allocation
+
+    Each agent's system_message is fixed at initialize(); per-call content goes
+    in run(task=...) so the provider's prefix cache can reuse the system prompt.
+    """
 
     def __init__(self, model_client, model_configs: Optional[ModelConfig] = None):
         self.model_client = model_client
@@ -80,6 +63,8 @@ class AgentManager:
 
     async def initialize(self, prompts: Dict[str, str]) -> bool:
         """Initialize all agents with error handling and comprehensive setup"""
+        from autogen_agentchat.agents import AssistantAgent
+
         print("🔧 初始化智能代理团队...")
 
         try:
@@ -103,13 +88,13 @@ class AgentManager:
             print(f"❌ 代理初始化失败: {e}")
             return False
 
-    def get_agent(self, agent_key: str) -> Optional[AssistantAgent]:
+    def get_agent(self, agent_key: str) -> Optional["AssistantAgent"]:
         """Get specific agent by key"""
         return self.agents.get(agent_key)
 
-    def get_agents(self, agent_keys: List[str]) -> List[AssistantAgent]:
+    def get_agents(self, agent_keys: List[str]) -> Tuple["AssistantAgent", ...]:
         """Get multiple agents by keys"""
-        return [self.agents[key] for key in agent_keys if key in self.agents]
+        return tuple(self.agents[key] for key in agent_keys if key in self.agents)
 
     def list_agents(self) -> Dict[str, str]:
         """List all available agents"""
@@ -130,6 +115,7 @@ class AgentManager:
         return False
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _convert_to_valid_identifier(name: str) -> str:
         """
         Convert string to valid Python identifier
@@ -152,7 +138,8 @@ class GroupChatCoordinator:
                                  agent_keys: List[str],
                                  task: str,
                                  max_rounds: int = 5,
-                                 enable_logging: bool = True) -> Dict[str, Any]:
+                                 enable_logging: bool = True,
+                                 sequential: bool = False) -> Dict[str, Any]:
         """Run structured group discussion among selected agents"""
         if not self.agent_manager.is_initialized():
             return {"error": "Agent manager not initialized", "result": task}
@@ -166,39 +153,77 @@ class GroupChatCoordinator:
 
         # Simple round-robin discussion simulation
         # In a real implementation, this would use proper group chat framework
-        current_result = task
+        # Keep contributions as parts and join once at the end; prompts only read
+        # the first 2000 characters, so that prefix stops growing once it is full
+        result_parts = [task]
+        prompt_head = task[:2000]
         discussion_history = []
 
-        for round_num in range(max_rounds):
-            for agent in agents:
-                try:
-                    result = await agent.run(task=f"基于以下信息发表意见：\\n{current_result[:2000]}")
-                    content = self._extract_content(result.messages)
-
-                    if enable_logging:
-                        print(f"  🗣️  {agent.name} (轮次 {round_num + 1}): {len(content)} 字")
-
-                    discussion_history.append({
-                        "agent": agent.name,
-                        "round": round_num + 1,
-                        "content": content,
-                        "timestamp": asyncio.get_event_loop().time()
-                    })
+        def _fold(content: str) -> None:
+            nonlocal prompt_head
+            piece = content[:1000]
+            result_parts.append(piece)
+            if len(prompt_head) < 2000:
+                prompt_head = f"{prompt_head}\\n\\n{piece}"[:2000]
 
-                    # Update the current result with the latest input
-                    current_result = f"{current_result}\\n\\n{content[:1000]}"
-
-                except Exception as e:
-                    print(f"  ⚠️  {agent.name} 轮次 {round_num + 1} 出错: {e}")
-                    continue
+        for round_num in range(max_rounds):
+            if sequential:
+                # Each agent sees the contributions made earlier in the same round
+                for agent in agents:
+                    try:
+                        result = await agent.run(task=f"基于以下信息发表意见：\\n{prompt_head}")
+                    except Exception as e:
+                        print(f"  ⚠️  {agent.name} 轮次 {round_num + 1} 出错: {e}")
+                        continue
+                    content = self._record_turn(agent, round_num, result, discussion_history, enable_logging)
+                    if content is not None:
+                        _fold(content)
+            else:
+                # Agents in a round only depend on the previous round, so run them together
+                prompt = f"基于以下信息发表意见：\\n{prompt_head}"
+                results = await asyncio.gather(
+                    *(agent.run(task=prompt) for agent in agents),
+                    return_exceptions=True
+                )
+                for agent, result in zip(agents, results):
+                    if isinstance(result, Exception):
+                        print(f"  ⚠️  {agent.name} 轮次 {round_num + 1} 出错: {result}")
+                        continue
+                    content = self._record_turn(agent, round_num, result, discussion_history, enable_logging)
+                    if content is not None:
+                        _fold(content)
 
         return {
-            "result": current_result,
+            "result": "\\n\\n".join(result_parts),
             "discussion_history": discussion_history,
             "participating_agents": [agent.name for agent in agents],
             "total_rounds": max_rounds
         }
 
+    def _record_turn(self,
+                     agent: "AssistantAgent",
+                     round_num: int,
+                     result: Any,
+                     discussion_history: List[Dict[str, Any]],
+                     enable_logging: bool) -> Optional[str]:
+        """Log one agent turn and return its content (None if it failed)"""
+        try:
+            content = self._extract_content(result.messages)
+        except Exception as e:
+            print(f"  ⚠️  {agent.name} 轮次 {round_num + 1} 出错: {e}")
+            return None
+
+        if enable_logging:
+            print(f"  🗣️  {agent.name} (轮次 {round_num + 1}): {len(content)} 字")
+
+        discussion_history.append({
+            "agent": agent.name,
+            "round": round_num + 1,
+            "content": content,
+            "timestamp": asyncio.get_event_loop().time()
+        })
+        return content
+
     def _extract_content(self, messages: List) -> str:
         """Simple content extraction from messages"""
         # This is a simplified version - in real implementation,
@@ -215,7 +240,7 @@ class GroupChatCoordinator:
 class DynamicModelAgentManager(AgentManager):
     """Agent manager with dynamic model selection capability"""
 
-    def __init__(self, model_client: OpenAIChatCompletionClient, model_registry: Dict[str, Any] = None):
+    def __init__(self, model_client: "OpenAIChatCompletionClient", model_registry: Dict[str, Any] = None):
         super().__init__(model_client)
         self.model_registry = model_registry or {}
         self.current_model_config = "default"
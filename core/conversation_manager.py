@@ -1,21 +1,32 @@
+import sys
+import time
 from typing import Dict, Any, List
 from datetime import datetime
 from utils import extract_content, extract_all_json, calculate_average_score
 
+def _with_iso_timestamps(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """导出时才把纳秒时间戳格式化为 ISO 字符串"""
+    return [
+        {**record, "timestamp": datetime.fromtimestamp(record["timestamp"] / 1e9).isoformat()}
+        for record in records
+    ]
+
+
 class ConversationManager:
     """管理对话和版本历史"""
     
     def __init__(self):
         self.conversation_history: List[Dict[str, Any]] = []
         self.story_versions: List[Dict[str, Any]] = []
+        self._version_index: Dict[int, int] = {}  # version -> story_versions 下标
         self.feedback_records: List[Dict[str, Any]] = []
         self.documentation_records: List[Dict[str, Any]] = []  # ✅ 已添加
     
     def add_conversation(self, phase: str, conversation: str, metadata: Dict = None):
         """添加对话记录"""
         record = {
-            "phase": phase,
-            "timestamp": datetime.now().isoformat(),
+            "phase": sys.intern(phase),  # 阶段名只有少数几种，驻留后各记录共享同一字符串
+            "timestamp": time.time_ns(),
             "conversation": conversation,
             "length": len(conversation),
             "metadata": metadata or {}
@@ -27,7 +38,7 @@ class ConversationManager:
         """记录档案员的提取和检查结果"""
         self.documentation_records.append({  # ✅ 现在可以正确使用
             "chapter_num": chapter_num,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "extraction": extraction_info,      # 提取的人物、时间线等
             "consistency_check": consistency_check  # 一致性检查结果
         })
@@ -36,31 +47,36 @@ class ConversationManager:
         """添加故事版本"""
         record = {
             "version": version,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "content": content,
             "length": len(content),
             "metadata": metadata or {}
         }
+        # 同一版本号保留第一次出现的位置，与原先的顺序查找结果一致
+        self._version_index.setdefault(version, len(self.story_versions))
         self.story_versions.append(record)
 
     
     def add_feedback(self, round_num: int, feedback: Dict[str, Any], metadata: Dict = None):
         """添加反馈记录"""
-        # 只计算有效的评分
-        valid_scores = [
-            data.get("score") 
-            for data in feedback.values() 
-            if isinstance(data, dict) and isinstance(data.get("score"), (int, float))
-        ]
+        # 只计算有效的评分（单次遍历累加，不构造中间列表）
+        total = 0
+        count = 0
+        for data in feedback.values():
+            if isinstance(data, dict):
+                score = data.get("score")
+                if isinstance(score, (int, float)):
+                    total += score
+                    count += 1
         
-        avg_score = sum(valid_scores) / len(valid_scores) if valid_scores else 0
+        avg_score = total / count if count else 0
         
         record = {
             "round": round_num,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "feedback": feedback,
             "avg_score": avg_score,
-            "valid_scores_count": len(valid_scores),
+            "valid_scores_count": count,
             "metadata": metadata or {}
         }
         self.feedback_records.append(record)
@@ -68,10 +84,8 @@ class ConversationManager:
     
     def get_story_version(self, version: int) -> str:
         """获取指定版本的故事"""
-        for record in self.story_versions:
-            if record["version"] == version:
-                return record["content"]
-        return ""
+        idx = self._version_index.get(version)
+        return self.story_versions[idx]["content"] if idx is not None else ""
     
     def get_latest_story(self) -> str:
         """获取最新版本的故事"""
@@ -92,8 +106,8 @@ class ConversationManager:
     def get_all_history(self) -> Dict[str, Any]:
         """获取完整的对话历史"""
         return {
-            "conversations": self.conversation_history,
-            "versions": self.story_versions,
-            "feedbacks": self.feedback_records,
-            "documentations": self.documentation_records
+            "conversations": _with_iso_timestamps(self.conversation_history),
+            "versions": _with_iso_timestamps(self.story_versions),
+            "feedbacks": _with_iso_timestamps(self.feedback_records),
+            "documentations": _with_iso_timestamps(self.documentation_records)
         }
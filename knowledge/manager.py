@@ -1,6 +1,8 @@
 # knowledge/manager.py
 import asyncio
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from .base import KnowledgeEntry
 from .storage import JsonFileKnowledgeStorage
 from .retriever import SimpleKnowledgeRetriever
@@ -8,9 +10,21 @@ from .retriever import SimpleKnowledgeRetriever
 class KnowledgeManager:
     """Main manager for knowledge base functionality"""
 
-    def __init__(self, storage_path: str = "data/knowledge_repo/json_storage.json"):
+    def __init__(self, storage_path: str = "data/knowledge_repo/json_storage.json",
+                 search_cache_size: int = 256, search_cache_ttl: float = 300.0):
         self.storage = JsonFileKnowledgeStorage(storage_path)
         self.retriever = SimpleKnowledgeRetriever(self.storage)
+        # (query, category, limit) -> (expires_at, results); LRU ordered, cleared on writes
+        self._search_cache: "OrderedDict[Tuple, Tuple[float, List[KnowledgeEntry]]]" = OrderedDict()
+        self._search_cache_size = search_cache_size
+        self._search_cache_ttl = search_cache_ttl
+        # Snapshot of all entries, rebuilt after the first read following a write
+        self._all_entries: Optional[List[KnowledgeEntry]] = None
+
+    def _invalidate(self):
+        """Drop cached reads after the knowledge base changes"""
+        self._all_entries = None
+        self._search_cache.clear()
 
     async def add_entry(
         self,
@@ -19,8 +33,8 @@ class KnowledgeManager:
         tags: List[str],
         knowledge_type: str,
         source: str = "manual"
-    ) -> bool:
-        """Add a new knowledge entry"""
+    ) -> Optional[str]:
+        """Add a new knowledge entry, returning its id (None if it was not saved)"""
         # Generate ID from hash of content
         import hashlib
         content_hash = hashlib.md5((title + content).encode()).hexdigest()
@@ -36,7 +50,10 @@ class KnowledgeManager:
             knowledge_type=knowledge_type
         )
 
-        return await self.storage.save_entry(entry)
+        if await self.storage.save_entry(entry):
+            self._invalidate()
+            return entry.id
+        return None
 
     async def get_entry(self, entry_id: str) -> Optional[KnowledgeEntry]:
         """Get a specific knowledge entry"""
@@ -49,23 +66,43 @@ class KnowledgeManager:
         limit: int = 5
     ) -> List[KnowledgeEntry]:
         """Search knowledge based on query and category"""
-        return await self.retriever.retrieve_knowledge(query, category, limit)
+        key = (query, category, limit)
+        now = time.monotonic()
+        cached = self._search_cache.get(key)
+        if cached and cached[0] > now:
+            self._search_cache.move_to_end(key)
+            return list(cached[1])
+
+        results = await self.retriever.retrieve_knowledge(query, category, limit)
+        self._search_cache[key] = (now + self._search_cache_ttl, results)
+        self._search_cache.move_to_end(key)
+        if len(self._search_cache) > self._search_cache_size:
+            self._search_cache.popitem(last=False)
+        return list(results)
+
+    async def _cached_entries(self) -> List[KnowledgeEntry]:
+        """Shared snapshot of all entries; callers must not mutate it"""
+        if self._all_entries is None:
+            self._all_entries = await self.storage.get_all_entries()
+        return self._all_entries
 
     async def get_all_entries(self) -> List[KnowledgeEntry]:
         """Get all knowledge entries"""
-        return await self.storage.get_all_entries()
+        return list(await self._cached_entries())
 
     async def update_entry(self, entry: KnowledgeEntry) -> bool:
         """Update an existing knowledge entry"""
+        self._invalidate()
         return await self.storage.update_entry(entry)
 
     async def delete_entry(self, entry_id: str) -> bool:
         """Delete a knowledge entry"""
+        self._invalidate()
         return await self.storage.delete_entry(entry_id)
 
     async def get_examples_by_type(self, example_type: str) -> List[KnowledgeEntry]:
         """Get examples of a specific type from knowledge base"""
-        all_entries = await self.get_all_entries()
+        all_entries = await self._cached_entries()
         return [
             entry for entry in all_entries
             if entry.knowledge_type == "example" and example_type.lower() in entry.tags
@@ -73,7 +110,7 @@ class KnowledgeManager:
 
     async def get_techniques_by_category(self, category: str) -> List[KnowledgeEntry]:
         """Get writing techniques in a specific category"""
-        all_entries = await self.get_all_entries()
+        all_entries = await self._cached_entries()
         return [
             entry for entry in all_entries
             if entry.knowledge_type == "technique" and category.lower() in entry.tags
@@ -26,9 +26,10 @@ class SimpleKnowledgeRetriever(BaseKnowledgeRetriever):
             content_lower = entry.content.lower()
             title_lower = entry.title.lower()
             # Score based on keyword matches
-            score = content_lower.count(query_lower) + title_lower.count(query_lower)
-            # Prefer exact matches in title
-            if query.lower() in title_lower.lower():
+            title_hits = title_lower.count(query_lower)
+            score = content_lower.count(query_lower) + title_hits
+            # Prefer exact matches in title (a non-zero count already implies containment)
+            if title_hits:
                 score += 10
             return score
 
@@ -13,6 +13,7 @@ class JsonFileKnowledgeStorage(BaseKnowledgeStorage):
     def __init__(self, storage_path: str = "data/knowledge_repo/json_storage.json"):
         self.storage_path = Path(storage_path)
         self.entries: Dict[str, KnowledgeEntry] = {}
+        self._write_lock = asyncio.Lock()
         self._ensure_directory()
         self._load_existing_data()
 
@@ -41,6 +42,17 @@ class JsonFileKnowledgeStorage(BaseKnowledgeStorage):
 
     def _save_to_file(self):
         """Save all entries to persistent storage"""
+        self._write_file(self._snapshot())
+
+    async def _save_to_file_async(self):
+        """Save all entries without blocking the event loop"""
+        # Snapshot on the loop thread so the worker never iterates a dict being mutated
+        data_to_save = self._snapshot()
+        async with self._write_lock:
+            await asyncio.to_thread(self._write_file, data_to_save)
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """Build the serializable representation of all entries"""
         entries_data = []
         for entry in self.entries.values():
             entries_data.append({
@@ -54,13 +66,15 @@ class JsonFileKnowledgeStorage(BaseKnowledgeStorage):
                 "knowledge_type": entry.knowledge_type
             })
 
-        data_to_save = {
+        return {
             "entries": entries_data,
             "metadata": {
                 "last_updated": datetime.now().isoformat()
             }
         }
 
+    def _write_file(self, data_to_save: Dict[str, Any]):
+        """Write serialized entries to disk"""
         with open(self.storage_path, 'w', encoding='utf-8') as f:
             json.dump(data_to_save, f, ensure_ascii=False, indent=2)
 
@@ -68,7 +82,7 @@ class JsonFileKnowledgeStorage(BaseKnowledgeStorage):
         """Save a knowledge entry"""
         entry.last_modified = datetime.now().isoformat()
         self.entries[entry.id] = entry
-        self._save_to_file()
+        await self._save_to_file_async()
         return True
 
     async def get_entry(self, entry_id: str) -> Optional[KnowledgeEntry]:
@@ -104,7 +118,7 @@ class JsonFileKnowledgeStorage(BaseKnowledgeStorage):
         """Delete a knowledge entry"""
         if entry_id in self.entries:
             del self.entries[entry_id]
-            self._save_to_file()
+            await self._save_to_file_async()
             return True
         return False
 
@@ -113,7 +127,7 @@ class JsonFileKnowledgeStorage(BaseKnowledgeStorage):
         if entry.id in self.entries:
             entry.last_modified = datetime.now().isoformat()
             self.entries[entry.id] = entry
-            self._save_to_file()
+            await self._save_to_file_async()
             return True
         return False
 
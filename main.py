@@ -1,17 +1,32 @@
 # main.py
 import asyncio
+import logging
 import os
-from pathlib import Path
+import queue
+import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
+import httpx
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_core.models import ModelInfo, ModelFamily
-import json
 
 from config import MODEL_CONFIG, PROMPTS_DIR, OUTPUT_DIR, CREATION_CONFIG
 from utils import load_all_prompts, save_json, save_text
 from phases import NovelWorkflowOrchestrator
 
+def start_log_listener() -> QueueListener:
+    """日志经队列交给后台线程写出，事件循环线程上不做阻塞的 stderr 写入"""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("   ⚠️  [%(name)s] %(message)s"))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(logging.WARNING)
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
 async def main():
     """主程序"""
 
@@ -30,10 +45,21 @@ async def main():
 
     # 初始化模型客户端
     print("\n🔌 初始化模型客户端...")
+    # HTTP/2 连接与自定义连接池上限；离开 async with 时关闭（包括提前返回的路径）
+    async with httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=httpx.Timeout(600.0, connect=10.0)
+    ) as http_client:
+        await run_workflow(api_key, http_client)
+
+async def run_workflow(api_key: str, http_client: httpx.AsyncClient):
+    """创建模型客户端并运行完整创作流程"""
     model_client = OpenAIChatCompletionClient(
         model=MODEL_CONFIG["model"],
         api_key=api_key,
         base_url=MODEL_CONFIG["base_url"],
+        http_client=http_client,
         model_info=ModelInfo(
             vision=MODEL_CONFIG["vision"],
             function_calling=MODEL_CONFIG["function_calling"],
@@ -121,7 +147,8 @@ async def main():
         # 保存故事文本
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         story_file = OUTPUT_DIR / f"novel_story_{timestamp}.txt"
-        save_text(final_output["final_story"], story_file)
+        final_story = final_output["final_story"]
+        save_text(final_story, story_file)
 
         # 保存完整数据
         data_file = OUTPUT_DIR / f"novel_data_{timestamp}.json"
@@ -130,29 +157,32 @@ async def main():
         # 保存对话历史 (从orchestrator)
         conversation_manager = orchestrator.get_conversation_manager()
         history_file = OUTPUT_DIR / f"conversation_history_{timestamp}.json"
+        all_history = conversation_manager.get_all_history()
         history_data = {
-            "conversations": getattr(conversation_manager, 'conversation_history', []),
-            "versions": getattr(conversation_manager, 'story_versions', {}),
-            "feedbacks": getattr(conversation_manager, 'feedback_records', {}),
-            "documentation": getattr(conversation_manager, 'documentation_records', {}),
-            "all_history": conversation_manager.get_all_history()
+            "conversations": all_history["conversations"],
+            "versions": all_history["versions"],
+            "feedbacks": all_history["feedbacks"],
+            "documentation": all_history["documentations"],
+            "all_history": all_history
         }
         save_json(history_data, history_file)
 
-        # 显示摘要
-        print("\n" + "="*60)
-        print("✅ 创作完成！")
-        print("="*60)
-        print(f"\n📊 创作摘要:")
-        print(f"  • 初始想法: {final_output['initial_idea'][:50]}...")  # First 50 chars
-        print(f"  • 故事字数: {len(final_output['final_story'])} 字")
-        print(f"  • 研究计划长度: {len(final_output['research_plan'])} 字符")
-        print(f"  • 创作模式: {'分章节模式' if CREATION_CONFIG['num_chapters'] > 1 else '单章模式'}")
-
-        print(f"\n📁 输出文件:")
-        print(f"  • 故事文本: {story_file}")
-        print(f"  • 完整数据: {data_file}")
-        print(f"  • 对话历史: {history_file}")
+        # 显示摘要（一次性输出）
+        summary_lines = [
+            "\n" + "="*60,
+            "✅ 创作完成！",
+            "="*60,
+            "\n📊 创作摘要:",
+            f"  • 初始想法: {final_output['initial_idea'][:50]}...",  # First 50 chars
+            f"  • 故事字数: {len(final_story)} 字",
+            f"  • 研究计划长度: {len(final_output['research_plan'])} 字符",
+            f"  • 创作模式: {'分章节模式' if CREATION_CONFIG['num_chapters'] > 1 else '单章模式'}",
+            "\n📁 输出文件:",
+            f"  • 故事文本: {story_file}",
+            f"  • 完整数据: {data_file}",
+            f"  • 对话历史: {history_file}"
+        ]
+        sys.stdout.write("\n".join(summary_lines) + "\n")
 
     except Exception as e:
         print(f"\n❌ 错误: {e}")
@@ -165,4 +195,13 @@ async def main():
         print("\n👋 程序结束")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+        _run = uvloop.run
+    except ImportError:
+        _run = asyncio.run
+    log_listener = start_log_listener()
+    try:
+        _run(main())
+    finally:
+        log_listener.stop()
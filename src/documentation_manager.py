@@ -1,9 +1,13 @@
 from typing import Dict, List, Optional
 import json
+import logging
+import orjson
 from dataclasses import dataclass
 import os
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class StoryDocumentation:
@@ -28,8 +32,8 @@ class DocumentationManager:
         """Load existing documentation or create a new one"""
         if os.path.exists(self.save_path):
             try:
-                with open(self.save_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.save_path, 'rb') as f:
+                    data = orjson.loads(f.read())
                 return StoryDocumentation(
                     characters=data.get("characters", {}),
                     timeline=data.get("timeline", []),
@@ -80,7 +84,7 @@ class DocumentationManager:
             # Save documentation
             self._save_documentation()
         except Exception as e:
-            print(f"Error updating documentation: {e}")
+            logger.warning("Error updating documentation: %s", e)
 
     def _save_documentation(self) -> None:
         """Save documentation to file"""
@@ -95,8 +99,8 @@ class DocumentationManager:
         }
 
         os.makedirs(os.path.dirname(self.save_path), exist_ok=True)
-        with open(self.save_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(self.save_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     def get_documentation(self) -> str:
         """Get documentation as JSON string"""
@@ -108,4 +112,4 @@ class DocumentationManager:
             "settings_locations": self.documentation.settings_locations,
             "updated_at": self.documentation.updated_at
         }
-        return json.dumps(data, ensure_ascii=False, indent=2)
\ No newline at end of file
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
\ No newline at end of file
@@ -1,11 +1,37 @@
-import json
 import asyncio
-from typing import List, Dict, Any
+import logging
+import orjson
+from typing import List, Dict, Any, Optional
 from core.agent_manager import AgentManager
 from core.conversation_manager import ConversationManager
 from src.documentation_manager import DocumentationManager
 from config import GROUPCHAT_CONFIGS, CREATION_CONFIG, SCORE_THRESHOLD, MAX_REVISION_ROUNDS
-from utils import extract_content, extract_all_json, calculate_average_score, format_feedback_summary
+from utils import extract_content, extract_all_json, extract_first_json, calculate_average_score, format_feedback_summary
+
+logger = logging.getLogger(__name__)
+
+
+# Review task prompts per reviewer, built once; the editor prompt is the fallback
+_REVIEW_TASK_TEMPLATES = {
+    "fact_checker": """
+请检查以下故事的事实准确性、逻辑一致性和情节连贯性：
+{story}
+
+返回评分和改进建议。
+""",
+    "dialogue_specialist": """
+请评估以下故事的对话质量、人物语言特色和表达效果：
+{story}
+
+返回评分和改进建议。
+""",
+    "editor": """
+请从整体上评估以下故事的文学质量、情节推进和读者吸引力：
+{story}
+
+返回评分和改进建议。
+"""
+}
 
 
 class NovelWritingPhases:
@@ -132,7 +158,7 @@ class NovelWritingPhases:
         writer_input = f"""
 根据以下研究数据创作网络小说初稿：
 
-{json.dumps(research_data, ensure_ascii=False, indent=2)}
+{orjson.dumps(research_data, option=orjson.OPT_INDENT_2).decode()}
 
 要求：
 - 初稿长度：2000-3000字
@@ -175,44 +201,61 @@ class NovelWritingPhases:
 
         chapters = []
         target_length = CREATION_CONFIG.get("target_length_per_chapter", 2000)
+        # A chapter's consistency check only feeds the conversation history, not the
+        # next chapter's context, so it overlaps with the writer on the next chapter
+        pending_check = None
+        # research_data does not change between chapters, so serialize its excerpt once
+        research_excerpt = orjson.dumps(research_data, option=orjson.OPT_INDENT_2).decode()[:1000]
 
-        for chapter_num in range(1, num_chapters + 1):
-            print(f"\n--- 第 {chapter_num} 章 ---")
-
-            # Create context with previous chapters and documentation
-            context = await self._prepare_chapter_context(
-                chapter_num, research_data, chapters, target_length
-            )
-
-            # Create chapter
-            chapter_result = await writer.run(task=context)
-            chapter = extract_content(chapter_result.messages)
-            chapters.append(chapter)
-
-            print(f"   ✅ 完成（{len(chapter)} 字）")
-
-            # Apply documentation and consistency checks
-            if doc_agent:
-                await self._update_documentation_for_chapter(chapter, chapter_num)
-            else:
-                # Just update documentation if no agent
-                chapter_info = {
-                    "chapter_num": chapter_num,
-                    "word_count": len(chapter),
-                    "summary": chapter[:200] + "..."
-                }
-                doc_content = json.dumps(chapter_info, ensure_ascii=False)
-                self.documentation_manager.update_documentation(doc_content)
-
-            # Save to conversation manager
-            self.conversation_manager.add_story_version(
-                chapter_num, chapter, {"chapter_num": chapter_num, "length": len(chapter)}
-            )
-
-            # Periodic consistency checks every few chapters
-            if chapter_num % 3 == 0:
-                print(f"   🔄 执行中期一致性检查...")
-                # Add intermediate review here if needed
+        try:
+            for chapter_num in range(1, num_chapters + 1):
+                print(f"\n--- 第 {chapter_num} 章 ---")
+
+                # Create context with previous chapters and documentation
+                context = await self._prepare_chapter_context(
+                    chapter_num, research_excerpt, chapters, target_length
+                )
+
+                # Create chapter
+                chapter_result = await writer.run(task=context)
+                chapter = extract_content(chapter_result.messages)
+                chapters.append(chapter)
+
+                print(f"   ✅ 完成（{len(chapter)} 字）")
+
+                # Apply documentation and consistency checks
+                if doc_agent:
+                    # The documentation agent must not run concurrently with itself
+                    if pending_check:
+                        await pending_check
+                    doc_content = await self._update_documentation_for_chapter(chapter, chapter_num)
+                    if doc_content is not None:
+                        pending_check = asyncio.create_task(
+                            self._check_chapter_consistency(chapter, chapter_num, doc_content)
+                        )
+                else:
+                    # Just update documentation if no agent
+                    chapter_info = {
+                        "chapter_num": chapter_num,
+                        "word_count": len(chapter),
+                        "summary": chapter[:200] + "..."
+                    }
+                    doc_content = orjson.dumps(chapter_info).decode()
+                    self.documentation_manager.update_documentation(doc_content)
+
+                # Save to conversation manager
+                self.conversation_manager.add_story_version(
+                    chapter_num, chapter, {"chapter_num": chapter_num, "length": len(chapter)}
+                )
+
+                # Periodic consistency checks every few chapters
+                if chapter_num % 3 == 0:
+                    print(f"   🔄 执行中期一致性检查...")
+                    # Add intermediate review here if needed
+        finally:
+            # Never leave the check running past the phase, even if a chapter fails
+            if pending_check:
+                await pending_check
 
         # Combine all chapters
         full_story = "\n\n".join(chapters)
@@ -221,14 +264,17 @@ class NovelWritingPhases:
 
         return full_story
 
-    async def _prepare_chapter_context(self, chapter_num: int, research_data: Dict,
+    async def _prepare_chapter_context(self, chapter_num: int, research_excerpt: str,
                                      previous_chapters: List[str], target_length: int) -> str:
-        """Prepare creation context including documentation"""
+        """Prepare creation context including documentation
+
+        research_excerpt is the pre-serialized (truncated) research data
+        """
         context = f"""
 第 {chapter_num} 章创作
 
 【故事背景】
-{json.dumps(research_data, ensure_ascii=False, indent=2)[:1000]}
+{research_excerpt}
 
 【已有文档】
 {self.documentation_manager.get_documentation()[:1000]}
@@ -253,11 +299,11 @@ class NovelWritingPhases:
 
         return context
 
-    async def _update_documentation_for_chapter(self, chapter: str, chapter_num: int):
-        """Update documentation using documentation agent"""
+    async def _update_documentation_for_chapter(self, chapter: str, chapter_num: int) -> Optional[str]:
+        """Update documentation using documentation agent, returning the extracted content"""
         doc_agent = self.agents_manager.get_agent("documentation_specialist")
         if not doc_agent:
-            return
+            return None
 
         # Task for documentation specialist to extract key information
         doc_task = f"""
@@ -270,8 +316,18 @@ class NovelWritingPhases:
             doc_result = await doc_agent.run(task=doc_task)
             doc_content = extract_content(doc_result.messages)
             self.documentation_manager.update_documentation(doc_content)
+            return doc_content
+        except Exception as e:
+            logger.warning("第 %d 章档案更新出错: %s", chapter_num, e)
+            return None
+
+    async def _check_chapter_consistency(self, chapter: str, chapter_num: int, doc_content: str):
+        """Run the consistency check for a chapter and record it with the extracted documentation"""
+        doc_agent = self.agents_manager.get_agent("documentation_specialist")
+        if not doc_agent:
+            return
 
-            # Also perform consistency check
+        try:
             consistency_task = f"""
 基于当前档案检查以下内容的一致性：
 章节内容：{chapter[:2000]}
@@ -286,7 +342,7 @@ class NovelWritingPhases:
                 extract_all_json(consistency_content)
             )
         except Exception as e:
-            print(f"   ⚠️  档案更新出错: {e}")
+            logger.warning("第 %d 章一致性检查出错: %s", chapter_num, e)
 
     async def phase3_review_refinement(self, story: str) -> str:
         """Complete phase 3 implementation for review and refinement"""
@@ -342,56 +398,41 @@ class NovelWritingPhases:
         if not self.agents_manager:
             return {"default": {"score": 75, "comments": "No agents available", "suggestions": ["Improve character development"]}}
 
-        feedback = {}
-
         agents_to_review = [
             ("fact_checker", "事实与逻辑检查"),
             ("dialogue_specialist", "对话质量评估"),
             ("editor", "整体质量把控")
         ]
 
+        # Reviewers are independent, so run them concurrently
+        async def _review(agent_name: str, description: str, agent) -> Dict[str, Any]:
+            print(f"   📝 {description}中...")
+            try:
+                review_result = await agent.run(task=self._create_review_task(story, agent_name))
+                review_content = extract_content(review_result.messages)
+                review_data = self._extract_json(review_content)
+                return review_data or {
+                    "score": 75,
+                    "comments": f"Default {agent_name} review",
+                    "suggestions": ["General improvement"]
+                }
+            except Exception as e:
+                logger.warning("%s 评审出错: %s", agent_name, e)
+                return {"score": 60, "error": str(e)}
+
+        reviews = []
         for agent_name, description in agents_to_review:
             agent = self.agents_manager.get_agent(agent_name)
             if agent:
-                print(f"   📝 {description}中...")
-                try:
-                    review_result = await agent.run(task=self._create_review_task(story, agent_name))
-                    review_content = extract_content(review_result.messages)
-                    review_data = self._extract_json(review_content)
-                    feedback[agent_name] = review_data or {
-                        "score": 75,
-                        "comments": f"Default {agent_name} review",
-                        "suggestions": ["General improvement"]
-                    }
-                except Exception as e:
-                    print(f"   ❌ {agent_name} 评审出错: {e}")
-                    feedback[agent_name] = {"score": 60, "error": str(e)}
+                reviews.append((agent_name, _review(agent_name, description, agent)))
 
-        return feedback
+        results = await asyncio.gather(*(coro for _, coro in reviews))
+        return {agent_name: result for (agent_name, _), result in zip(reviews, results)}
 
     def _create_review_task(self, story: str, agent_type: str) -> str:
         """Create appropriate review task based on agent type"""
-        if agent_type == "fact_checker":
-            return f"""
-请检查以下故事的事实准确性、逻辑一致性和情节连贯性：
-{story[:3000]}
-
-返回评分和改进建议。
-"""
-        elif agent_type == "dialogue_specialist":
-            return f"""
-请评估以下故事的对话质量、人物语言特色和表达效果：
-{story[:3000]}
-
-返回评分和改进建议。
-"""
-        else:  # editor
-            return f"""
-请从整体上评估以下故事的文学质量、情节推进和读者吸引力：
-{story[:3000]}
-
-返回评分和改进建议。
-"""
+        template = _REVIEW_TASK_TEMPLATES.get(agent_type, _REVIEW_TASK_TEMPLATES["editor"])
+        return template.format_map({"story": story[:3000]})
 
     async def _revise_story(self, story: str, feedback: Dict[str, Any]) -> str:
         """Apply revision based on feedback"""
@@ -409,7 +450,7 @@ class NovelWritingPhases:
 {story[:4000]}
 
 评审反馈：
-{json.dumps(feedback, ensure_ascii=False, indent=2)}
+{orjson.dumps(feedback, option=orjson.OPT_INDENT_2).decode()}
 
 请在保持原故事核心的情节下，根据以上反馈进行改进，并返回完整修订版。
 """
@@ -460,5 +501,4 @@ class NovelWritingPhases:
 
     def _extract_json(self, text: str) -> Dict[str, Any]:
         """Extract JSON from text with error handling"""
-        json_objects = extract_all_json(text)
-        return json_objects[0] if json_objects else {}
\ No newline at end of file
+        return extract_first_json(text)
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""Tests for the BaseAIAgent response caches"""
+import asyncio
+import importlib.util
+import unittest
+
+from ai_agents.base import BaseAIAgent, SemanticCache
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class EchoAgent(BaseAIAgent):
+    """Minimal concrete agent that counts backend calls"""
+
+    def __init__(self, model_config, delay: float = 0.0):
+        super().__init__("echo", "system", model_config)
+        self.calls = 0
+        self.delay = delay
+
+    async def process(self, input_data):
+        return await self.run(input_data)
+
+    def get_capabilities(self):
+        return []
+
+    async def _run_uncached(self, prompt):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return {"response": prompt, "tags": []}
+
+
+class BaseAgentCacheTest(unittest.TestCase):
+    def setUp(self):
+        BaseAIAgent._cache.clear()
+        BaseAIAgent._inflight.clear()
+
+    def test_missing_temperature_is_not_cached(self):
+        agent = EchoAgent({"model": "gpt-4"})
+        asyncio.run(agent.run("write a story"))
+        asyncio.run(agent.run("write a story"))
+        self.assertEqual(agent.calls, 2)
+
+    def test_nonzero_temperature_is_not_cached(self):
+        agent = EchoAgent({"temperature": 0.7})
+        asyncio.run(agent.run("write a story"))
+        asyncio.run(agent.run("write a story"))
+        self.assertEqual(agent.calls, 2)
+
+    def test_temperature_zero_is_cached(self):
+        agent = EchoAgent({"temperature": 0})
+        first = asyncio.run(agent.run("classify"))
+        second = asyncio.run(agent.run("classify"))
+        self.assertEqual(agent.calls, 1)
+        self.assertEqual(first, second)
+
+    def test_cached_result_is_not_shared_by_reference(self):
+        agent = EchoAgent({"temperature": 0})
+        first = asyncio.run(agent.run("classify"))
+        first["tags"].append("mutated")
+        second = asyncio.run(agent.run("classify"))
+        self.assertEqual(second["tags"], [])
+
+
+class FailingAgent(EchoAgent):
+    """Agent whose backend call raises after the delay"""
+
+    async def _run_uncached(self, prompt):
+        await super()._run_uncached(prompt)
+        raise RuntimeError("backend down")
+
+
+class InflightCoalescingTest(unittest.TestCase):
+    def setUp(self):
+        BaseAIAgent._cache.clear()
+        BaseAIAgent._inflight.clear()
+
+    def test_concurrent_identical_calls_hit_backend_once(self):
+        agent = EchoAgent({"temperature": 0}, delay=0.01)
+        coalesced = BaseAIAgent.cache_coalesced
+
+        async def scenario():
+            return await asyncio.gather(*(agent.run("classify") for _ in range(5)))
+
+        results = asyncio.run(scenario())
+        self.assertEqual(agent.calls, 1)
+        self.assertEqual(BaseAIAgent.cache_coalesced - coalesced, 4)
+        self.assertEqual(results, [results[0]] * 5)
+        self.assertIsNot(results[0], results[1])
+        self.assertEqual(BaseAIAgent._inflight, {})
+
+    def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        agent = EchoAgent({"temperature": 0}, delay=0.01)
+
+        async def scenario():
+            first = asyncio.ensure_future(agent.run("classify"))
+            second = asyncio.ensure_future(agent.run("classify"))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(scenario())["response"], "classify")
+        self.assertEqual(agent.calls, 1)
+        self.assertEqual(len(BaseAIAgent._cache), 1)
+
+    def test_failed_call_is_shared_but_not_cached(self):
+        agent = FailingAgent({"temperature": 0}, delay=0.01)
+
+        async def scenario():
+            return await asyncio.gather(
+                agent.run("classify"), agent.run("classify"), return_exceptions=True
+            )
+
+        results = asyncio.run(scenario())
+        self.assertEqual(agent.calls, 1)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(BaseAIAgent._inflight, {})
+        self.assertEqual(len(BaseAIAgent._cache), 0)
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy is required for SemanticCache")
+class SemanticCacheTest(unittest.TestCase):
+    def _cache(self, max_entries: int) -> SemanticCache:
+        # One orthogonal axis per distinct prompt: only identical prompts match
+        axes = {"a": 0, "b": 1, "c": 2, "d": 3}
+
+        async def embed_fn(prompt):
+            vector = [0.0] * len(axes)
+            vector[axes[prompt]] = 1.0
+            return vector
+        return SemanticCache(embed_fn, threshold=0.9, max_entries=max_entries)
+
+    def test_similar_prompt_hits(self):
+        cache = self._cache(8)
+        cache.add(asyncio.run(cache.embed("a")), "first")
+        hit, response = cache.lookup(asyncio.run(cache.embed("a")))
+        self.assertTrue(hit)
+        self.assertEqual(response, "first")
+
+    def test_full_cache_overwrites_oldest_entry(self):
+        cache = self._cache(3)
+        prompts = ["a", "b", "c", "d"]
+        for prompt in prompts:
+            cache.add(asyncio.run(cache.embed(prompt)), prompt)
+        self.assertEqual(cache._size, 3)
+        # "a" was the oldest entry and has been replaced by "d"
+        hit, _ = cache.lookup(asyncio.run(cache.embed("a")))
+        self.assertFalse(hit)
+        for prompt in prompts[1:]:
+            hit, response = cache.lookup(asyncio.run(cache.embed(prompt)))
+            self.assertTrue(hit)
+            self.assertEqual(response, prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
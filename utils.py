@@ -1,6 +1,8 @@
 # utils.py
+import os
 import re
 import json
+import orjson
 from pathlib import Path
 from typing import Dict, Any, List
 
@@ -42,19 +44,27 @@ def parse_json_response(response: str) -> dict:
     except (json.JSONDecodeError, TypeError):
         return {"raw_response": response}
 
-def extract_all_json(text: str) -> List[Dict[str, Any]]:
-    """从文本中提取所有JSON对象"""
-    json_matches = re.findall(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text)
-    results = []
-    
-    for match in json_matches:
+_JSON_DECODER = json.JSONDecoder()
+
+def _iter_json_objects(text: str):
+    """从每个 '{' 处用 raw_decode 尝试解析，成功后直接跳到该对象末尾继续"""
+    pos = text.find('{')
+    while pos != -1:
         try:
-            data = json.loads(match)
-            results.append(data)
+            obj, end = _JSON_DECODER.raw_decode(text, pos)
         except json.JSONDecodeError:
+            pos = text.find('{', pos + 1)
             continue
-    
-    return results
+        yield obj
+        pos = text.find('{', end)
+
+def extract_all_json(text: str) -> List[Dict[str, Any]]:
+    """从文本中提取所有JSON对象"""
+    return list(_iter_json_objects(text))
+
+def extract_first_json(text: str) -> Dict[str, Any]:
+    """提取文本中第一个JSON对象，找到即停止"""
+    return next(_iter_json_objects(text), {})
 
 def calculate_average_score(feedback: Dict[str, Any]) -> float:
     """计算平均评分"""
@@ -78,14 +88,13 @@ def format_feedback_summary(feedback: Dict[str, Any]) -> str:
 
 def save_json(data: Dict[str, Any], file_path: Path):
     """保存JSON文件"""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f"✅ 已保存: {file_path}")
+    save_text(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode(), file_path)
 
 def save_text(content: str, file_path: Path):
     """保存文本文件"""
     file_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    # 先写临时文件再原子替换，中断时不会留下半截文件
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, file_path)
     print(f"✅ 已保存: {file_path}")